@@ -27,10 +27,11 @@ import contextlib
 import functools
 import json
 import operator
+import os
 import pathlib
+import shutil
 import subprocess
-import time
-from itertools import filterfalse
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Optional
 from urllib.error import URLError
 
@@ -38,18 +39,19 @@ import mpy_cross
 import typer
 from rich.columns import Columns
 from rich.panel import Panel
-from rich.progress import Task
+from rich.progress import Task, TaskID
 from rich.tree import Tree
 from typing_extensions import Annotated
 
-from .utils.exceptions import CompilationError
-from .utils.exportation import build_directory_tree
-from .utils.installation import download_mpy_package
+from .utils.compilation import compile_target
+from .utils.exportation import build_directory_tree, walk_exports
+from .utils.installation import connection_pool, download_mpy_package
 from .utils.progress import command, commands, progress_display, progress_panel
 from .utils.project import ProjectPath
 
 config_file = pathlib.Path(__file__).parent / "config" / "commands.json"
-config = json.loads(config_file.read_bytes())
+with config_file.open("rb") as config_fp:
+    config = json.load(config_fp)
 
 app = typer.Typer(**config["typer"])
 
@@ -69,9 +71,8 @@ def cross_compile(
     """
 
     compiler_args = ("-march=armv6m",)
-    popen_kwargs = {"stderr": subprocess.PIPE, "universal_newlines": True}
+    popen_kwargs = {"stdout": subprocess.DEVNULL, "stderr": subprocess.PIPE}
     compiler = functools.partial(mpy_cross.run, *compiler_args, **popen_kwargs)
-    compiled = operator.methodcaller("with_suffix", ".mpy")
 
     project = ProjectPath()
     targets = project.python if targets is None else targets
@@ -86,33 +87,45 @@ def cross_compile(
             commands_id = commands.add_task("", total=len(targets))
             commands.start_task(commands_id)
             update_commands = True
-            map(command.remove_task, command.task_ids)
+            for task_id in list(command.task_ids):
+                command.remove_task(task_id)
 
-        for item in targets:
-            name = item.relative_to(project.package, walk_up=True)
-            try:
+        def compiled(
+            name: pathlib.Path, command_id: TaskID, message: Optional[str]
+        ) -> None:
+            command.update(command_id, description="Compiled", advance=1)
+            commands.update(commands_id, advance=update_commands)
+
+        def failed(
+            name: pathlib.Path, command_id: TaskID, message: Optional[str]
+        ) -> None:
+            commands.console.log(f"[b red]Compilation error for {name}")
+            if message:
+                commands.console.log(message, markup=False)
+            command.update(command_id, description="Error")
+
+        def timed_out(
+            name: pathlib.Path, command_id: TaskID, message: Optional[str]
+        ) -> None:
+            commands.console.log(f"[b red]Compilation timed out for {name}")
+            command.update(command_id, description="Error")
+
+        outcomes = {"ok": compiled, "error": failed, "timeout": timed_out}
+
+        # mpy-cross runs in a subprocess, so threads compile in parallel
+        max_workers = min(len(targets), os.cpu_count() or 1) or 1
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for item in targets:
+                name = item.relative_to(project.package, walk_up=True)
                 command_id = command.add_task("Compiling", item=name, total=1)
-                process: subprocess.Popen = compiler(item)
-                stdout, stderr = process.communicate(timeout=5)
-                if process.returncode:
-                    raise CompilationError(str(name))
-                while not compiled(item).exists():
-                    time.sleep(1)
-            except CompilationError:
-                commands.console.log(f"[b red]Compilation error for {name}")
-                command.update(command_id, description="Error")
-            except subprocess.TimeoutExpired:
-                process.kill()
-                commands.console.log(f"[b red]Compilation timed out")
-            except Exception as e:
-                commands.console.log(f"[b red]Unhandled error: {e}")
-                command.update(command_id, description="Error")
-            # no exceptions raised
-            else:
-                command.update(command_id, description="Compiled", advance=1)
-                commands.update(commands_id, advance=update_commands)
-            # before end of try
-            finally:
+                future = executor.submit(compile_target, compiler, item)
+                futures[future] = (name, command_id)
+
+            for future in as_completed(futures):
+                name, command_id = futures[future]
+                outcome, message = future.result()
+                outcomes[outcome](name, command_id, message)
                 command.stop_task(command_id)
         # hide successful tasks
         for task in filter(operator.attrgetter("finished"), command.tasks):
@@ -151,7 +164,11 @@ def install(
             commands_id = commands.add_task("", total=len(packages))
             commands.start_task(commands_id)
             update_commands = True
-            map(command.remove_task, command.task_ids)
+            for task_id in list(command.task_ids):
+                command.remove_task(task_id)
+
+        # close keep-alive connections once all packages are installed
+        cm.callback(connection_pool.close)
 
         project = ProjectPath()
         directory = project.lib if directory is None else directory
@@ -192,8 +209,7 @@ def export(
     """[b green]Export[/b green] project files for distribution."""
 
     project = ProjectPath()
-    exports = project.package.rglob("*.*")
-    exports = sorted(filterfalse(lambda x: x.match("*.pyc"), exports))
+    exports = sorted(walk_exports(project.package))
 
     with contextlib.ExitStack() as cm:
         update_commands = False
@@ -205,37 +221,50 @@ def export(
             commands_id = commands.add_task("", total=len(exports))
             commands.start_task(commands_id)
             update_commands = True
-            map(command.remove_task, command.task_ids)
+            for task_id in list(command.task_ids):
+                command.remove_task(task_id)
+
+        # create each export directory once, parents before children
+        export_directories = {
+            (project.export / item.relative_to(project.package)).parent
+            for item in exports
+        }
+        export_directories.add(project.export)
+        for path in sorted(export_directories, key=lambda x: len(x.parts)):
+            path.mkdir(parents=True, exist_ok=True)
 
-        try:
-            project.export.mkdir()
-        except FileExistsError:
-            pass
-
-        python_file = operator.methodcaller("match", "*.py")
         micropython_version = operator.methodcaller("with_suffix", ".mpy")
 
+        # compile items missing a precompiled version in a single batch
+        compile_targets = frozenset()
+        if precompiled:
+            compile_targets = frozenset(
+                item
+                for item in exports
+                if item.suffix == ".py"
+                and not micropython_version(item).exists()
+            )
+            if compile_targets:
+                cross_compile(targets=tuple(sorted(compile_targets)))
+
         commands_total = len(exports)
         for item in exports:
             item_name = item.relative_to(project.package)
             command_id = command.add_task("Exporting", item=item_name, total=1)
 
             item_export = project.export / item_name
-            item_export.parent.mkdir(parents=True, exist_ok=True)
             if precompiled:
-                if python_file(item):
+                if item.suffix == ".py":
                     # remove previous export
                     if item_export.exists():
                         item_export.unlink()
-                    # check for precompiled version
+                    # precompiled version exported separately
                     item_compiled = micropython_version(item)
-                    if item_compiled.exists():
+                    if item not in compile_targets:
                         commands_total -= 1
                         command.stop_task(command_id)
                         commands.update(commands_id, total=commands_total)
                         continue
-                    # compile item (precompiled version missing)
-                    cross_compile(targets=(item,))
                     # if successfully compiled
                     if item_compiled.exists():
                         command.stop_task(command_id)
@@ -248,7 +277,7 @@ def export(
 
                         # convert Python item_export path suffix
                         item_export = micropython_version(item_export)
-                        item_export.write_bytes(item_compiled.read_bytes())
+                        shutil.copyfile(item_compiled, item_export)
 
                         description = "Exported/Compiled"
                         command.update(
@@ -260,7 +289,7 @@ def export(
                     command.stop_task(command_id)
                     command.update(command_id, description="Error")
 
-            item_export.write_bytes(item.read_bytes())
+            shutil.copyfile(item, item_export)
             command.update(command_id, description="Exported", advance=1)
             commands.update(commands_id, advance=update_commands)
         # hide successful tasks
@@ -298,7 +327,8 @@ def format_pico():
     """[b red]Format[/b red] microcontroller filesystem."""
 
     config_mpremote = config_file.parent / "mpremote.json"
-    instructions = json.loads(config_mpremote.read_bytes())
+    with config_mpremote.open("rb") as f:
+        instructions = json.load(f)
 
     with contextlib.ExitStack() as cm:
         update_commands = False
@@ -310,7 +340,8 @@ def format_pico():
             commands_id = commands.add_task("", total=1)
             commands.start_task(commands_id)
             update_commands = True
-            map(command.remove_task, command.task_ids)
+            for task_id in list(command.task_ids):
+                command.remove_task(task_id)
 
         try:
             command_id = command.add_task("Formatting", item="", total=1)
@@ -1,3 +1,47 @@
 """Compilation module which contains classes and functions used in the
 compilation process of project Python files.
+
+Functions:
+    compile_target: Compiles a single Python file with mpy-cross.
 """
+
+import pathlib
+import subprocess
+from typing import Callable, Optional
+
+
+def compile_target(
+    compiler: Callable[[pathlib.Path], subprocess.Popen],
+    item: pathlib.Path,
+    timeout: float = 5,
+) -> tuple[str, Optional[str]]:
+    """Compile a single Python file, blocking until mpy-cross exits.
+
+    Args:
+        compiler (Callable): Starts an mpy-cross process for a target.
+        item (Path): Compilation target.
+        timeout (float): Seconds to wait before killing mpy-cross.
+
+    Returns:
+        Outcome tuple - ("ok", None), ("error", message) or
+        ("timeout", None).
+    """
+    try:
+        process: subprocess.Popen = compiler(item)
+    except OSError as e:
+        return "error", str(e)
+
+    try:
+        _, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return "timeout", None
+    finally:
+        # kill & reap a timed out process, so no zombie is left behind
+        if process.returncode is None:
+            process.kill()
+            process.communicate()
+
+    # output is written before mpy-cross exits
+    if process.returncode:
+        return "error", stderr.decode(errors="replace").strip()
+    return "ok", None
@@ -4,18 +4,44 @@ project for distribution to a Raspberry Pi Pico device.
 Functions:
     build_export_tree: Builds a Rich Tree instance representing export
         directory.
+    walk_exports: Yields exportable files within a directory tree.
 """
 
-import operator
+import os
 import pathlib
+from typing import Iterator, Union
 
 from rich.filesize import decimal
 from rich.text import Text
 from rich.tree import Tree
 
 
+def walk_exports(root: Union[str, pathlib.Path]) -> Iterator[pathlib.Path]:
+    """Yield exportable files within a directory tree in a single pass.
+
+    Exportable files have a suffix ('*.*') and are not CPython bytecode.
+
+    Args:
+        root (Path): Root directory to search.
+
+    Returns:
+        Iterator of exportable file Path instances.
+    """
+    # like rglob, unreadable & symlinked directories are skipped
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from walk_exports(entry.path)
+                elif "." in entry.name and not entry.name.endswith(".pyc"):
+                    if entry.is_file():
+                        yield pathlib.Path(entry.path)
+    except (FileNotFoundError, PermissionError):
+        pass
+
+
 def build_directory_tree(
-    path: pathlib.Path, tree: Tree, precompiled: bool = False
+    path: Union[str, pathlib.Path], tree: Tree, precompiled: bool = False
 ) -> None:
     """Build a directory Tree recursively, using rich formatting.
 
@@ -24,30 +50,35 @@ def build_directory_tree(
         tree (Tree): Tree instance to modify.
         precompiled (bool): Highlight non-compiled files.
     """
-    directory = operator.methodcaller("is_dir")
-    python_file = operator.methodcaller("match", "*.py")
-    cpython_file = operator.methodcaller("match", "*.pyc")
-
-    sorted_paths = sorted(path.iterdir(), key=lambda x: f"{x.is_file()}{x}")
-    for item in sorted_paths:
-        if directory(item):
-            branch_name = Text(f"{item.name}", "b bright_cyan")
-            if item.stem == "__pycache__":
+
+    def python_file(entry: os.DirEntry) -> bool:
+        return entry.name.endswith(".py")
+
+    def cpython_file(entry: os.DirEntry) -> bool:
+        return entry.name.endswith(".pyc")
+
+    # DirEntry caches file type & stat results, avoiding repeat syscalls
+    with os.scandir(path) as entries:
+        sorted_entries = sorted(entries, key=lambda x: (x.is_file(), x.name))
+    for entry in sorted_entries:
+        if entry.is_dir():
+            branch_name = Text(f"{entry.name}", "b bright_cyan")
+            if entry.name == "__pycache__":
                 branch_name.stylize("dim")
             branch = tree.add(branch_name)
-            build_directory_tree(item, branch, precompiled)
+            build_directory_tree(entry.path, branch, precompiled)
         else:
-            icon = "🐍" if python_file(item) else "📄"
-            item_name = Text(f"{item.name}", "gray100")
-            if precompiled and python_file(item) or cpython_file(item):
+            icon = "🐍" if python_file(entry) else "📄"
+            item_name = Text(f"{entry.name}", "gray100")
+            if precompiled and python_file(entry) or cpython_file(entry):
                 item_name.stylize("red strike")
             else:
-                if item.stem == "__init__":
+                if os.path.splitext(entry.name)[0] == "__init__":
                     item_name.stylize("dim")
             # create file details branch
             details = Text(f"{icon} ")
             details.append(item_name)
-            size = decimal(item.stat().st_size)
+            size = decimal(entry.stat().st_size)
             details.append(f" ({size})", "gray62")
             # create entry in tree
             tree.add(details)
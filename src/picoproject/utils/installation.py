@@ -1,19 +1,236 @@
 """Installation helper functions and classes for Typer CLI.
 
 Classes:
+    ConnectionPool: Pool of persistent HTTP(S) connections.
     PackageIndex: Used to interface with the Micropython index.
 
 Functions:
     download_mpy_package: Downloads packages from MicroPython index.
 """
 
+import base64
+import contextlib
 import functools
+import http.client
+import itertools
 import json
 import operator
 import pathlib
+import shutil
+import threading
 import traceback
+import urllib.parse
 import urllib.request
-from urllib.error import URLError
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterator, Optional
+from urllib.error import HTTPError, URLError
+
+# redirects followed per request, matching urllib.request
+MAX_REDIRECTS = 10
+REDIRECT_CODES = frozenset((301, 302, 303, 307, 308))
+
+
+class ConnectionPool:
+    """Thread-safe pool of persistent (keep-alive) HTTP(S) connections,
+    avoiding a TCP & TLS handshake per request to the same host.
+
+    Like urllib.request.urlopen, proxies set by the 'http_proxy',
+    'https_proxy' & 'no_proxy' environment variables are used and
+    redirects are followed.
+    """
+
+    def __init__(self):
+        """Initialise ConnectionPool."""
+
+        self._idle: dict[tuple, list[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def urlopen(self, url: str) -> Iterator[http.client.HTTPResponse]:
+        """Send a GET request over a pooled connection.
+
+        The connection is returned to the pool on exit if the response body
+        was read in full, otherwise it is closed.
+
+        Args:
+            url (str): Request URL.
+
+        Yields:
+            HTTPResponse instance with status 200.
+
+        Raises:
+            HTTPError: Response status was not 200.
+            URLError: Connection error.
+        """
+        for _ in range(MAX_REDIRECTS + 1):
+            key, connection, response = self._request(url)
+            location = response.headers.get("Location")
+            if response.status not in REDIRECT_CODES or not location:
+                break
+            response.read()
+            self._release(key, connection, response)
+            url = urllib.parse.urljoin(url, location)
+
+        try:
+            if response.status != 200:
+                response.read()
+                status, reason = response.status, response.reason
+                raise HTTPError(url, status, reason, response.headers, None)
+            yield response
+        finally:
+            self._release(key, connection, response)
+
+    def close(self) -> None:
+        """Close all idle connections."""
+
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for connection in itertools.chain.from_iterable(idle.values()):
+            connection.close()
+
+    def _request(self, url: str) -> tuple:
+        """Send a GET request, retrying on a new connection if the server
+        closed an idle pooled connection.
+
+        Args:
+            url (str): Request URL.
+
+        Returns:
+            tuple containing the pool key, connection & response.
+
+        Raises:
+            URLError: Connection error.
+        """
+        parts = urllib.parse.urlsplit(url)
+        proxy = self._proxy(parts)
+        key = (parts.scheme, parts.netloc, proxy)
+
+        # fragments are client side only, so never sent
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        # plain HTTP proxies expect the absolute URL as the request target
+        # & proxy credentials on every request
+        headers = {}
+        if proxy and parts.scheme == "http":
+            target = f"http://{parts.netloc}{target}"
+            headers = self._proxy_headers(proxy)
+
+        while True:
+            connection, reused = self._acquire(key, parts, proxy)
+            try:
+                connection.request("GET", target, headers=headers)
+                return key, connection, connection.getresponse()
+            except (http.client.HTTPException, OSError) as e:
+                connection.close()
+                if not reused:
+                    raise URLError(e) from e
+
+    def _acquire(
+        self,
+        key: tuple,
+        parts: urllib.parse.SplitResult,
+        proxy: Optional[str],
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """Take an idle connection from the pool or create a new one.
+
+        Args:
+            key (tuple): Pool key.
+            parts (SplitResult): Request URL parts.
+            proxy (str, optional): Proxy URL.
+
+        Returns:
+            tuple containing the connection & True if it was pooled.
+        """
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+
+        if parts.scheme == "https":
+            connection_class = http.client.HTTPSConnection
+        else:
+            connection_class = http.client.HTTPConnection
+        if proxy is None:
+            return connection_class(parts.netloc), False
+
+        proxy_parts = urllib.parse.urlsplit(proxy)
+        connection = connection_class(proxy_parts.hostname, proxy_parts.port)
+        if parts.scheme == "https":
+            headers = self._proxy_headers(proxy)
+            connection.set_tunnel(parts.hostname, parts.port, headers)
+        return connection, False
+
+    def _release(
+        self,
+        key: tuple,
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+    ) -> None:
+        """Return a connection to the pool if it can be reused, otherwise
+        close it.
+
+        Args:
+            key (tuple): Pool key.
+            connection (HTTPConnection): Connection to release.
+            response (HTTPResponse): Last response on the connection.
+        """
+        if response.isclosed() and not response.will_close:
+            with self._lock:
+                self._idle.setdefault(key, []).append(connection)
+        else:
+            connection.close()
+
+    @staticmethod
+    def _proxy(parts: urllib.parse.SplitResult) -> Optional[str]:
+        """Proxy URL for a request, from environment variables.
+
+        Args:
+            parts (SplitResult): Request URL parts.
+
+        Returns:
+            Proxy URL or None if the request is not proxied.
+        """
+        proxy = urllib.request.getproxies().get(parts.scheme)
+        if not proxy or urllib.request.proxy_bypass(parts.hostname or ""):
+            return None
+        return proxy if "://" in proxy else f"http://{proxy}"
+
+    @staticmethod
+    def _proxy_headers(proxy: str) -> dict[str, str]:
+        """Proxy-Authorization header for credentials in a proxy URL.
+
+        Args:
+            proxy (str): Proxy URL.
+
+        Returns:
+            dict containing the header, or an empty dict if the proxy URL
+            has no credentials.
+        """
+        proxy_parts = urllib.parse.urlsplit(proxy)
+        if not proxy_parts.username:
+            return {}
+        credentials = urllib.parse.unquote(
+            f"{proxy_parts.username}:{proxy_parts.password or ''}"
+        )
+        token = base64.b64encode(credentials.encode()).decode()
+        return {"Proxy-Authorization": f"Basic {token}"}
+
+
+# connections shared by all downloads, closed by the install command
+connection_pool = ConnectionPool()
+
+
+def _urlopen(url: str) -> contextlib.AbstractContextManager:
+    """Send a GET request using the shared connection pool.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        Context manager yielding an HTTPResponse instance with status 200.
+    """
+    return connection_pool.urlopen(url)
 
 
 class PackageIndex:
@@ -24,8 +241,8 @@ class PackageIndex:
     def __init__(self):
         """Initialise PackageIndex."""
 
-        with urllib.request.urlopen(self.index_url) as r:
-            package_index = json.loads(r.read())
+        with _urlopen(self.index_url) as r:
+            package_index = json.load(r)
         self._index = tuple(package_index["packages"])
 
     @property
@@ -60,7 +277,37 @@ class PackageIndex:
         return package_info.get("path", "").startswith("python-stdlib")
 
 
-def download_mpy_package(package: str, target: pathlib.Path):
+@functools.lru_cache(maxsize=1)
+def _get_package_index() -> PackageIndex:
+    """Fetch the MicroPython package index once per process.
+
+    Returns:
+        Shared PackageIndex instance.
+    """
+    return PackageIndex()
+
+
+def _download_file(file_url: str, output_path: pathlib.Path) -> None:
+    """Download a single package file from the MicroPython index.
+
+    Args:
+        file_url (str): File URL.
+        output_path (Path): File save location.
+
+    Raises:
+        URLError: Request error raised by urllib.
+    """
+    with _urlopen(file_url) as r:
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with output_path.open("wb") as f:
+            shutil.copyfileobj(r, f, length=64 * 1024)
+
+
+def download_mpy_package(
+    package: str,
+    target: pathlib.Path,
+    package_index: Optional[PackageIndex] = None,
+):
     """Downloads a MicroPython package and dependencies, saving all
     files to the 'project-slug/src/project_name/lib directory'.
 
@@ -68,8 +315,9 @@ def download_mpy_package(package: str, target: pathlib.Path):
 
     Args:
         package (str): Package name.
-        standard_library (tuple): Standard library package names.
-        target (str, optional): Target installation folder.
+        target (Path): Target installation folder.
+        package_index (PackageIndex, optional): MicroPython package index,
+            defaults to an index shared by all calls.
 
     Raises:
         JSONDecodeError: Failed to decode package info.
@@ -77,7 +325,7 @@ def download_mpy_package(package: str, target: pathlib.Path):
         URLError: Request error raised by urllib.
     """
 
-    package_index = PackageIndex()
+    package_index = package_index or _get_package_index()
 
     if not target.is_dir():
         raise FileNotFoundError(f"Project {str(target)} directory missing.")
@@ -85,9 +333,10 @@ def download_mpy_package(package: str, target: pathlib.Path):
     mpy_index = "https://micropython.org/pi/v2"
     try:
         package_url = f"{mpy_index}/package/py/{package}/latest.json"
-        with urllib.request.urlopen(package_url) as r:
-            package_info = json.loads(r.read())
+        with _urlopen(package_url) as r:
+            package_info = json.load(r)
 
+        downloads = []
         for file_path, file_hash in package_info.get("hashes", ()):
             file_path = pathlib.Path(file_path)
             if file_path.parent.name == "":
@@ -102,16 +351,20 @@ def download_mpy_package(package: str, target: pathlib.Path):
                 continue
 
             file_url = f"{mpy_index}/file/{file_hash[:2]}/{file_hash}"
-            with urllib.request.urlopen(file_url) as r:
-                if r.status == 200:
-                    output_path = target / file_path
-                    if not file_path.parent.name == "":
-                        output_path.parent.mkdir(parents=True, exist_ok=True)
-                    output_path.write_bytes(r.read())
+            downloads.append((file_url, target / file_path))
+
+        # package files are independent, so fetch them concurrently
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            futures = itertools.starmap(
+                functools.partial(executor.submit, _download_file), downloads
+            )
+            for future in as_completed(tuple(futures)):
+                future.result()
     except URLError as e:
-        if e.status == 404:
+        if getattr(e, "status", None) == 404:
             raise URLError(f"'{package}' not found in MicroPython index.")
-        raise URLError(f"Unknown error - {e.status} | {e.reason}")
+        status = getattr(e, "status", None)
+        raise URLError(f"Unknown error - {status} | {e.reason}")
     except json.JSONDecodeError:
         raise
     except FileExistsError:
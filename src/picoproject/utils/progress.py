@@ -9,6 +9,8 @@ Exceptions:
         library.
 """
 
+import re
+
 from rich.columns import Columns
 from rich.console import Group
 from rich.highlighter import Highlighter
@@ -49,6 +51,23 @@ class Singleton(object):
 class ProgressColour(Highlighter):
     """Custom rich text Highlighter class."""
 
+    # compiled once, as highlight is called on every Progress refresh
+    regex_styles = (
+        (
+            re.compile(
+                r"(?P<status>(Compiling|Exporting|Installing|Formatting).+)"
+            ),
+            "magenta",
+        ),
+        (
+            re.compile(
+                r"(?P<status>(Compiled|Exported|Installed|Formatted).+)"
+            ),
+            "bright_green",
+        ),
+        (re.compile(r"(?P<status>Error.+)"), "bright_red"),
+    )
+
     def highlight(self, text: Text) -> None:
         """Highlight text based on task description.
 
@@ -59,19 +78,7 @@ class ProgressColour(Highlighter):
             None
         """
 
-        regex_styles = (
-            (
-                r"(?P<status>(Compiling|Exporting|Installing|Formatting).+)",
-                "magenta",
-            ),
-            (
-                r"(?P<status>(Compiled|Exported|Installed|Formatted).+)",
-                "bright_green",
-            ),
-            (r"(?P<status>Error.+)", "bright_red"),
-        )
-
-        for regex, colour in regex_styles:
+        for regex, colour in self.regex_styles:
             if text.highlight_regex(regex, colour, style_prefix="b"):
                 return
 
@@ -24,9 +24,9 @@ Classes:
 
 import functools
 import itertools
-import operator
+import os
 import pathlib
-from typing import Iterable, Iterator, Union
+from typing import Iterator
 
 
 class ProjectPath:
@@ -40,19 +40,13 @@ class ProjectPath:
             FileExistsError if project root not identified.
         """
 
-        marker_exists = operator.methodcaller("is_file")
-
         # marker files indicative of project root
         markers = ("pyproject.toml", "README.md", "LICENSE")
+        root_markers = frozenset((".picoproject", *markers))
 
         current_directory = pathlib.Path.cwd().resolve()
         for path in (current_directory, *current_directory.parents):
-            if marker_exists(path / ".picoproject"):
-                self._root = path
-                break
-
-            marker_paths = zip(itertools.repeat(path, len(markers)), markers)
-            if any(map(marker_exists, self._combine_paths(marker_paths))):
+            if self._contains_marker(path, root_markers):
                 self._root = path
                 break
 
@@ -118,19 +112,55 @@ class ProjectPath:
     def python(self) -> tuple[pathlib.Path]:
         """Python file path instances within package."""
         return tuple(
-            itertools.chain(self.package.glob("*.py"), self.lib.rglob("*.py"))
+            itertools.chain(
+                self._scandir_py(self.package, recursive=False),
+                self._scandir_py(self.lib),
+            )
         )
 
+    @classmethod
+    def _scandir_py(
+        cls, root: pathlib.Path, recursive: bool = True
+    ) -> Iterator[pathlib.Path]:
+        """Yield Python files within a directory, using os.scandir to reuse
+        the cached DirEntry file type instead of a stat call per entry.
+
+        Args:
+            root (Path): Directory to search.
+            recursive (bool): Search subdirectories.
+
+        Returns:
+            Iterator of Python file Path instances.
+        """
+        try:
+            with os.scandir(root) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive:
+                            yield from cls._scandir_py(entry.path)
+                    elif entry.name.endswith(".py"):
+                        yield pathlib.Path(entry.path)
+        except (FileNotFoundError, PermissionError):
+            pass
+
     @staticmethod
-    def _combine_paths(
-        items: Iterator[Iterable[Union[str, pathlib.Path]]],
-    ) -> Iterator:
-        """Combine two Path instances or a Path and a str to make a new Path.
+    def _contains_marker(path: pathlib.Path, markers: frozenset[str]) -> bool:
+        """Check for root marker files with a single directory listing.
 
         Args:
-            path_items (PathItems): Path items to combine
+            path (Path): Directory to check.
+            markers (frozenset): Marker file names.
 
         Returns:
-            Combined Path from object pairs
+            True if a marker file is in the directory else False.
         """
-        return itertools.starmap(operator.truediv, items)
+        try:
+            with os.scandir(path) as entries:
+                return any(
+                    entry.name in markers and entry.is_file()
+                    for entry in entries
+                )
+        except (FileNotFoundError, PermissionError):
+            return False
@@ -0,0 +1,135 @@
+"""Shared pytest fixtures for CLI command tests.
+
+Fixtures:
+    app: Typer CLI app instance.
+    runner: Pre-warmed Typer CliRunner instance.
+    command_progress: Shared command Progress, cleared after each test.
+    mpy_index_responses: Canned MicroPython index responses.
+    mpy_index: Serves MicroPython index requests from canned responses.
+"""
+
+import hashlib
+import io
+import json
+from typing import Iterator
+from urllib.error import HTTPError
+
+import pytest
+import typer
+from rich.progress import Progress
+from typer.testing import CliRunner
+
+from picoproject.utils import installation
+from picoproject.utils.progress import command
+
+MPY_INDEX = "https://micropython.org/pi/v2"
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    """Register the '--run-network' command line option."""
+    parser.addoption(
+        "--run-network",
+        action="store_true",
+        default=False,
+        help="Use the real MicroPython index instead of canned responses.",
+    )
+
+
+@pytest.fixture(scope="session")
+def app() -> typer.Typer:
+    """Typer CLI app instance, imported once per test session.
+
+    Returns:
+        Typer app instance.
+    """
+    from picoproject.main import app
+
+    return app
+
+
+@pytest.fixture(scope="session")
+def runner(app: typer.Typer) -> CliRunner:
+    """CliRunner shared by all tests. CliRunner holds no state between
+    invoke calls, so sharing is safe. A '--help' invocation builds the
+    Click command tree once, up front.
+
+    Args:
+        app (Typer): Typer CLI app instance.
+
+    Returns:
+        CliRunner instance.
+    """
+    runner = CliRunner()
+    runner.invoke(app, ("--help",), standalone_mode=False)
+    return runner
+
+
+@pytest.fixture
+def command_progress() -> Iterator[Progress]:
+    """Shared command Progress instance, with all tasks removed on teardown,
+    even if the test fails.
+
+    The Progress is module level state, which is per process, so tests
+    remain independent under pytest-xdist workers.
+
+    Yields:
+        Command Progress instance.
+    """
+    yield command
+    for task_id in list(command.task_ids):
+        command.remove_task(task_id)
+
+
+@pytest.fixture(scope="session")
+def mpy_index_responses() -> dict[str, bytes]:
+    """Canned MicroPython index responses, built once per test session.
+
+    Contains 'umqtt.simple' and the 'base64' standard library package.
+
+    Returns:
+        dict mapping request URLs to response bodies.
+    """
+    module = b"class MQTTClient:\n    pass\n"
+    module_hash = hashlib.sha256(module).hexdigest()[:8]
+
+    index = {
+        "packages": [
+            {"name": "base64", "path": "python-stdlib/base64"},
+            {"name": "umqtt.simple", "path": "micropython/umqtt.simple"},
+        ]
+    }
+    base64 = {"hashes": [["base64.py", "00000000"]]}
+    umqtt_simple = {"hashes": [["umqtt/simple.py", module_hash]]}
+
+    package_url = f"{MPY_INDEX}/package/py"
+    return {
+        f"{MPY_INDEX}/index.json": json.dumps(index).encode(),
+        f"{package_url}/base64/latest.json": json.dumps(base64).encode(),
+        f"{package_url}/umqtt.simple/latest.json": json.dumps(
+            umqtt_simple
+        ).encode(),
+        f"{MPY_INDEX}/file/{module_hash[:2]}/{module_hash}": module,
+    }
+
+
+@pytest.fixture
+def mpy_index(
+    request: pytest.FixtureRequest,
+    monkeypatch: pytest.MonkeyPatch,
+    mpy_index_responses: dict[str, bytes],
+) -> Iterator[None]:
+    """Serve MicroPython index requests from canned responses, unless the
+    '--run-network' option is given. Unknown URLs respond with a 404.
+    """
+
+    def urlopen(url: str) -> io.BytesIO:
+        if url not in mpy_index_responses:
+            raise HTTPError(url, 404, "Not Found", None, None)
+        return io.BytesIO(mpy_index_responses[url])
+
+    if not request.config.getoption("--run-network"):
+        monkeypatch.setattr(installation, "_urlopen", urlopen)
+    # the shared index must not leak between canned and real responses
+    installation._get_package_index.cache_clear()
+    yield
+    installation._get_package_index.cache_clear()
@@ -18,34 +18,118 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 Functions:
-    test_compile_command: CLI compile command test function.
-    test_install_command: CLI install command test function.
+    test_command: CLI compile & install command test function.
+    test_export_command: CLI export command test function.
+    test_export_command_precompiled: CLI export --precompiled test function.
 """
 
 import importlib.util
 import operator
+import os
 import pathlib
-import shutil
-from typing import List
+from typing import List, Optional
 
+import pytest
+import typer
 from rich.progress import Task
 from typer.testing import CliRunner
 
-from picoproject.main import app
-from picoproject.utils.progress import command
 from picoproject.utils.project import ProjectPath
 
-runner = CliRunner()
 
-
-def test_compile_command():
-    """Test Typer CLI compile command."""
-
-    target = pathlib.Path(__file__)
-    compiled_target = target.with_suffix(".mpy")
-
-    args = ("compile", (target,))
-    result = runner.invoke(app, args, standalone_mode=False)
+@pytest.fixture
+def project_root(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> pathlib.Path:
+    """Minimal project within tmp_path, set as the working directory.
+
+    Returns:
+        Project root directory Path.
+    """
+    root = tmp_path / "sample-project"
+    package = root / "src" / "sample_project"
+    (package / "lib").mkdir(parents=True)
+    (package / "config").mkdir()
+    (root / "pyproject.toml").write_text("")
+    (package / "__init__.py").write_text("")
+    (package / "main.py").write_bytes(pathlib.Path(__file__).read_bytes())
+    (package / "lib" / "sample.py").write_text("")
+    (package / "config" / "config.json").write_text("{}")
+    monkeypatch.chdir(root)
+    return root
+
+
+@pytest.fixture
+def cmd_args(
+    request: pytest.FixtureRequest, project_root: pathlib.Path
+) -> tuple[str, ...]:
+    """CLI arguments built from a parametrized callable and the project
+    package path. A sample compilation target is written to the package.
+
+    Returns:
+        CLI arguments tuple.
+    """
+    package = ProjectPath().package
+    target = package / "sample.py"
+    target.write_bytes(pathlib.Path(__file__).read_bytes())
+    return request.param(package.as_posix())
+
+
+@pytest.mark.usefixtures("command_progress", "mpy_index")
+@pytest.mark.parametrize(
+    "cmd_args, description, item, output",
+    (
+        (
+            lambda path: ("compile", (f"{path}/sample.py",)),
+            "Compiled",
+            "sample.py",
+            "sample.mpy",
+        ),
+        (
+            lambda path: (
+                "install",
+                "umqtt.simple",
+                "--directory",
+                f"{path}/lib",
+            ),
+            "Installed",
+            "umqtt.simple",
+            "lib/umqtt/simple.py",
+        ),
+        # umqtt.simple23 not found in MicroPython Index
+        (
+            lambda path: (
+                "install",
+                "umqtt.simple23",
+                "--directory",
+                f"{path}/lib",
+            ),
+            "Error",
+            "umqtt.simple23",
+            None,
+        ),
+        # base64 in MicroPython standard library
+        (
+            lambda path: ("install", "base64", "--directory", f"{path}/lib"),
+            "Error",
+            "base64",
+            None,
+        ),
+    ),
+    ids=("compile", "install", "install-not-found", "install-stdlib"),
+    indirect=("cmd_args",),
+)
+def test_command(
+    app: typer.Typer,
+    runner: CliRunner,
+    cmd_args: tuple[str, ...],
+    description: str,
+    item: str,
+    output: Optional[str],
+) -> None:
+    """Test Typer CLI compile & install commands."""
+
+    result = runner.invoke(app, cmd_args, standalone_mode=False)
 
     # Result properties
     # exc_info, exception, exit_code output, return_value
@@ -53,55 +137,23 @@ def test_compile_command():
 
     tasks: List[Task] = result.return_value
     task, *_ = tasks
-    assert task.finished
-    assert not task.visible
-    assert task.description == "Compiled"
-    assert task.fields["item"].name == target.name
-    assert compiled_target.is_file()
-
-    compiled_target.unlink()
-    command.remove_task(task.id)
-
-
-def test_install_command(tmp_path: pathlib.Path) -> None:
-    """Test Typer CLI install command."""
-
-    tmp_path.mkdir(exist_ok=True)
-
-    args = ("install", "umqtt.simple", "--directory", tmp_path.as_posix())
-    result = runner.invoke(app, args, standalone_mode=False)
-
-    tasks: List[Task] = result.return_value
-    task, *_ = tasks
-    assert task.finished
-    assert not task.visible
-    assert task.description == "Installed"
-    command.remove_task(task.id)
-
-    # umqtt.simple23 not found in MicroPython Index
-    args = ("install", "umqtt.simple23", "--directory", tmp_path.as_posix())
-    result = runner.invoke(app, args, standalone_mode=False)
-
-    tasks: List[Task] = result.return_value
-    task, *_ = tasks
-    assert not task.finished
-    assert task.visible
-    assert task.description == "Error"
-    command.remove_task(task.id)
-
-    # base64 in MicroPython standard library
-    args = ("install", "base64", "--directory", tmp_path.as_posix())
-    result = runner.invoke(app, args, standalone_mode=False)
-
-    tasks: List[Task] = result.return_value
-    task, *_ = tasks
-    assert not task.finished
-    assert task.visible
-    assert task.description == "Error"
-    command.remove_task(task.id)
-
-
-def test_export_command() -> None:
+    succeeded = description != "Error"
+    assert task.finished == succeeded
+    assert task.visible != succeeded
+    assert task.description == description
+    assert pathlib.Path(task.fields["item"]).name == item
+    if output is not None:
+        # single directory listing, DirEntry.is_file needs no extra stat
+        directory, _, name = output.rpartition("/")
+        with os.scandir(ProjectPath().package / directory) as it:
+            entries = {entry.name: entry for entry in it}
+        assert name in entries and entries[name].is_file()
+
+
+@pytest.mark.usefixtures("command_progress")
+def test_export_command(
+    app: typer.Typer, runner: CliRunner, project_root: pathlib.Path
+) -> None:
     """Test Typer CLI export command."""
     args = ("export",)
     result = runner.invoke(app, args, standalone_mode=False)
@@ -111,11 +163,49 @@ def test_export_command() -> None:
     assert not any(map(visible, tasks))
 
     project = ProjectPath()
+    assert project.export == project_root / "export"
     export_paths = tuple(project.export / i.fields["item"] for i in tasks)
+    assert len(export_paths) == 4
     is_file = operator.methodcaller("is_file")
     assert all(map(is_file, export_paths))
 
-    shutil.rmtree(project.export)
 
-    for task in tasks:
-        command.remove_task(task.id)
+@pytest.mark.usefixtures("command_progress")
+def test_export_command_precompiled(
+    app: typer.Typer, runner: CliRunner, project_root: pathlib.Path
+) -> None:
+    """Test Typer CLI export command with the --precompiled option."""
+    project = ProjectPath()
+    # existing .mpy file & Python file which fails to compile
+    (project.lib / "sample.mpy").write_bytes(b"M\x06")
+    (project.package / "bad.py").write_text("def bad(:\n")
+
+    args = ("export", "--precompiled")
+    result = runner.invoke(app, args, standalone_mode=False)
+    tasks: List[Task] = result.return_value
+
+    exports = sorted(
+        path.relative_to(project_root / "export").as_posix()
+        for path in project.export.rglob("*")
+        if path.is_file()
+    )
+    # failed compilation falls back to exporting the Python source
+    assert exports == [
+        "__init__.mpy",
+        "bad.py",
+        "config/config.json",
+        "lib/sample.mpy",
+        "main.mpy",
+    ]
+    assert (project.export / "lib" / "sample.mpy").read_bytes() == b"M\x06"
+
+    (error,) = (task for task in tasks if task.description == "Error")
+    assert error.fields["item"] == pathlib.Path("bad.py")
+    assert error.visible
+
+    compiled = sorted(
+        pathlib.Path(task.fields["item"]).as_posix()
+        for task in tasks
+        if task.description == "Exported/Compiled"
+    )
+    assert compiled == ["__init__.mpy", "main.mpy"]
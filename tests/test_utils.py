@@ -0,0 +1,376 @@
+"""Utility module test functions.
+
+Author: Andrew Ridyard.
+License: GNU General Public License v3 or later.
+Copyright (C): 2024.
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+This program is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+Functions:
+    test_walk_exports_symlinks: Export walk does not follow symlinked dirs.
+    test_connection_pool_reuse: Keep-alive connections are reused.
+    test_connection_pool_target: Request targets exclude URL fragments.
+    test_connection_pool_stale: Stale pooled connections are replaced.
+    test_connection_pool_errors: Request errors raise urllib exceptions.
+    test_connection_pool_proxy: Requests use the environment HTTP proxy.
+    test_connection_pool_tunnel: HTTPS requests tunnel through the proxy.
+"""
+
+import base64
+import contextlib
+import os
+import pathlib
+import select
+import shutil
+import socket
+import socketserver
+import ssl
+import subprocess
+import threading
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+from urllib.error import HTTPError, URLError
+
+import pytest
+
+from picoproject.utils.exportation import walk_exports
+from picoproject.utils.installation import ConnectionPool
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 request handler, which counts connections & requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def setup(self) -> None:
+        """Count each new connection."""
+
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self) -> None:
+        """Respond to '/file', '/redirect', '/drop' or with a 404."""
+
+        self.server.paths.append(self.path)
+        self.server.proxy_auth.append(self.headers["Proxy-Authorization"])
+        path = urllib.parse.urlsplit(self.path).path
+        if path == "/redirect":
+            self.send_response(302)
+            self.send_header("Location", "/file")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        status, body = 404, b""
+        if path in ("/file", "/drop"):
+            status, body = 200, b"content"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # close without 'Connection: close', leaving the client a stale
+        # keep-alive connection
+        self.close_connection = path == "/drop"
+
+    def log_message(self, format: str, *args) -> None:
+        """Silence request logging."""
+
+
+class TunnelHandler(socketserver.StreamRequestHandler):
+    """HTTPS proxy handler, which records each CONNECT request & relays
+    the tunnel to its target.
+    """
+
+    def handle(self) -> None:
+        """Open a CONNECT tunnel & relay data until either side closes."""
+
+        self.server.connections += 1
+        method, target, _ = self.rfile.readline().decode().split()
+        headers = {}
+        while (line := self.rfile.readline().decode()).strip():
+            name, _, value = line.partition(":")
+            headers[name.strip()] = value.strip()
+        proxy_auth = headers.get("Proxy-Authorization")
+        self.server.requests.append((method, target, proxy_auth))
+
+        host, _, port = target.rpartition(":")
+        with socket.create_connection((host, int(port))) as upstream:
+            self.wfile.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+            self.wfile.flush()
+            sockets = {self.connection: upstream, upstream: self.connection}
+            while True:
+                readable, _, _ = select.select(tuple(sockets), (), ())
+                for sock in readable:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    sockets[sock].sendall(data)
+
+
+@contextlib.contextmanager
+def serving(server: socketserver.BaseServer) -> Iterator[None]:
+    """Run a server in a background thread, shutting it down on exit."""
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@pytest.fixture
+def server() -> Iterator[ThreadingHTTPServer]:
+    """Local keep-alive HTTP server, running in a background thread.
+
+    Yields:
+        ThreadingHTTPServer instance.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.connections = 0
+    server.paths = []
+    server.proxy_auth = []
+    with serving(server):
+        yield server
+
+
+@pytest.fixture(scope="session")
+def certificate(tmp_path_factory: pytest.TempPathFactory) -> pathlib.Path:
+    """Self-signed 'localhost' certificate & key, in a single PEM file.
+
+    Returns:
+        PEM file Path.
+    """
+    if shutil.which("openssl") is None:
+        pytest.skip("openssl is required to create a test certificate")
+
+    directory = tmp_path_factory.mktemp("tls")
+    key, cert = directory / "key.pem", directory / "cert.pem"
+    args = (
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+        "-days", "1", "-subj", "/CN=localhost",
+        "-addext", "subjectAltName=DNS:localhost",
+        "-keyout", key, "-out", cert,
+    )  # fmt: skip
+    subprocess.run(args, check=True, capture_output=True)
+    pem = directory / "localhost.pem"
+    pem.write_bytes(cert.read_bytes() + key.read_bytes())
+    return pem
+
+
+@pytest.fixture
+def tls_server(
+    certificate: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> Iterator[ThreadingHTTPServer]:
+    """Local keep-alive HTTPS server, trusted through 'SSL_CERT_FILE'.
+
+    Yields:
+        ThreadingHTTPServer instance.
+    """
+    monkeypatch.setenv("SSL_CERT_FILE", str(certificate))
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(certificate)
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.socket = context.wrap_socket(server.socket, server_side=True)
+    server.connections = 0
+    server.paths = []
+    server.proxy_auth = []
+    with serving(server):
+        yield server
+
+
+@pytest.fixture
+def tunnel_proxy() -> Iterator[socketserver.ThreadingTCPServer]:
+    """Local HTTPS (CONNECT) proxy, running in a background thread.
+
+    Yields:
+        ThreadingTCPServer instance.
+    """
+    proxy = socketserver.ThreadingTCPServer(("127.0.0.1", 0), TunnelHandler)
+    proxy.daemon_threads = True
+    proxy.connections = 0
+    proxy.requests = []
+    with serving(proxy):
+        yield proxy
+
+
+@pytest.fixture
+def pool(monkeypatch: pytest.MonkeyPatch) -> Iterator[ConnectionPool]:
+    """ConnectionPool without environment proxies, closed on teardown.
+
+    Yields:
+        ConnectionPool instance.
+    """
+    for name in ("http_proxy", "https_proxy", "no_proxy"):
+        monkeypatch.delenv(name, raising=False)
+        monkeypatch.delenv(name.upper(), raising=False)
+    pool = ConnectionPool()
+    yield pool
+    pool.close()
+
+
+def server_url(server: ThreadingHTTPServer, path: str) -> str:
+    """URL for a path on the local server."""
+
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+
+def test_walk_exports_symlinks(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test walk_exports skips symlinked & unreadable directories and
+    CPython bytecode.
+    """
+
+    package = tmp_path / "package"
+    (package / "a" / "__pycache__").mkdir(parents=True)
+    (package / "a" / "f.txt").write_text("f")
+    (package / "a" / "__pycache__" / "f.cpython-312.pyc").write_bytes(b"")
+    # symlink loop back to the package directory
+    (package / "a" / "loop").symlink_to(package, target_is_directory=True)
+    (package / "a" / "link.d").symlink_to(package, target_is_directory=True)
+
+    # unreadable directory, also denied when tests run as root
+    locked = package / "locked"
+    locked.mkdir()
+    (locked / "g.txt").write_text("g")
+    scandir = os.scandir
+
+    def denied_scandir(path):
+        if pathlib.Path(path) == locked:
+            raise PermissionError(13, "Permission denied", str(path))
+        return scandir(path)
+
+    monkeypatch.setattr(os, "scandir", denied_scandir)
+    locked.chmod(0)
+    try:
+        exports = sorted(walk_exports(package))
+    finally:
+        locked.chmod(0o755)
+    assert exports == [package / "a" / "f.txt"]
+
+
+def test_connection_pool_reuse(
+    server: ThreadingHTTPServer, pool: ConnectionPool
+) -> None:
+    """Test requests & redirects share one keep-alive connection."""
+
+    for path in ("/file", "/file", "/redirect"):
+        with pool.urlopen(server_url(server, path)) as r:
+            assert r.read() == b"content"
+
+    assert server.connections == 1
+    assert server.paths == ["/file", "/file", "/redirect", "/file"]
+
+
+def test_connection_pool_target(
+    server: ThreadingHTTPServer, pool: ConnectionPool
+) -> None:
+    """Test the request target keeps the query & drops the fragment."""
+
+    with pool.urlopen(server_url(server, "/file?q=1#fragment")) as r:
+        assert r.read() == b"content"
+    assert server.paths == ["/file?q=1"]
+
+
+def test_connection_pool_stale(
+    server: ThreadingHTTPServer, pool: ConnectionPool
+) -> None:
+    """Test a pooled connection closed by the server is replaced."""
+
+    with pool.urlopen(server_url(server, "/drop")) as r:
+        assert r.read() == b"content"
+    with pool.urlopen(server_url(server, "/file")) as r:
+        assert r.read() == b"content"
+
+    assert server.connections == 2
+
+
+def test_connection_pool_errors(
+    server: ThreadingHTTPServer, pool: ConnectionPool
+) -> None:
+    """Test non-200 responses raise HTTPError & connection errors raise
+    URLError.
+    """
+
+    with pytest.raises(HTTPError) as e:
+        with pool.urlopen(server_url(server, "/missing")):
+            pass
+    assert e.value.status == 404
+
+    # connection reused after an error response
+    with pool.urlopen(server_url(server, "/file")) as r:
+        assert r.read() == b"content"
+    assert server.connections == 1
+
+    # closed port, connection refused
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    with pytest.raises(URLError):
+        with pool.urlopen(f"http://127.0.0.1:{port}/file"):
+            pass
+
+
+def test_connection_pool_proxy(
+    server: ThreadingHTTPServer,
+    pool: ConnectionPool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test HTTP requests are sent to the 'http_proxy' environment proxy,
+    with the proxy credentials.
+    """
+
+    host, port = server.server_address[:2]
+    monkeypatch.setenv("http_proxy", f"http://user:p%40ss@{host}:{port}")
+    for _ in range(2):
+        url = "http://micropython.invalid/file?q=1#fragment"
+        with pool.urlopen(url) as r:
+            assert r.read() == b"content"
+
+    assert server.connections == 1
+    assert server.paths == ["http://micropython.invalid/file?q=1"] * 2
+    token = base64.b64encode(b"user:p@ss").decode()
+    assert server.proxy_auth == [f"Basic {token}"] * 2
+
+
+def test_connection_pool_tunnel(
+    tls_server: ThreadingHTTPServer,
+    tunnel_proxy: socketserver.ThreadingTCPServer,
+    pool: ConnectionPool,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test HTTPS requests tunnel through the 'https_proxy' environment
+    proxy with the proxy credentials, reusing one tunnel.
+    """
+
+    host, port = tunnel_proxy.server_address[:2]
+    monkeypatch.setenv("https_proxy", f"http://user:pass@{host}:{port}")
+    target = f"localhost:{tls_server.server_address[1]}"
+    for _ in range(3):
+        with pool.urlopen(f"https://{target}/file") as r:
+            assert r.read() == b"content"
+
+    token = base64.b64encode(b"user:pass").decode()
+    assert tunnel_proxy.requests == [("CONNECT", target, f"Basic {token}")]
+    assert tunnel_proxy.connections == 1
+    assert tls_server.connections == 1
+    assert tls_server.paths == ["/file"] * 3
+    # proxy credentials are only sent to the proxy
+    assert tls_server.proxy_auth == [None] * 3